@@ -21,12 +21,22 @@ Properties file format:
 """
 
 import argparse
+import concurrent.futures
+import hashlib
+import json
+import logging
+import mmap
 import os
+import re
+import shutil
 import subprocess
 import sys
 import tempfile
+import zipfile
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
 # Default configuration - modify these values as needed
 DEFAULT_CONFIG = {
     'aab_file': 'app.aab',
@@ -35,60 +45,197 @@ DEFAULT_CONFIG = {
     'signing_properties': 'signing.properties'
 }
 
+# JVM tuning for bundletool's short, one-shot runs: serial GC, C1 only
+# (C2 never pays back in a single run) and smaller thread stacks
+JVM_SHORTLIVED_FLAGS = ['-XX:+UseSerialGC', '-XX:TieredStopAtLevel=1', '-Xss512k']
 
-class BundletoolWrapper:
-    def __init__(self, bundletool_path):
-        self.bundletool_path = Path(bundletool_path)
-        self.java_cmd = self._find_java()
+# How much of bundletool's stderr to show when a command fails
+STDERR_TAIL_BYTES = 4096
+
+# Bump when the layout written by --compile-config changes
+COMPILED_CONFIG_VERSION = 1
+
+# Rough peak memory of one bundletool build-apks run, used to size the worker pool
+BUNDLETOOL_MEMORY_PER_WORKER = 1_500_000_000
+
+# Per-user cache for values that are expensive to recompute between runs
+CACHE_DIR = Path.home() / '.cache' / 'aab_to_apk'
+
+# Upper bound for cached APK sets; least recently used ones are pruned beyond it
+APKS_CACHE_MAX_BYTES = 2 * 1024 ** 3
+
+
+def _find_java():
+    """Find Java executable in JAVA_HOME, otherwise rely on PATH
+    
+    No probe process is started: a missing 'java' surfaces as
+    FileNotFoundError on the first real bundletool run.
+    """
+    java_home = os.environ.get('JAVA_HOME')
+    if java_home:
+        java_exe = Path(java_home) / 'bin' / ('java.exe' if os.name == 'nt' else 'java')
+        if java_exe.exists():
+            return str(java_exe)
+    
+    return 'java'
+
+
+def _file_digest(path, algorithm):
+    """Return the hex digest of a file without reading it into Python memory"""
+    with open(path, 'rb') as f:
+        if hasattr(hashlib, 'file_digest'):
+            return hashlib.file_digest(f, algorithm).hexdigest()
         
-    def _find_java(self):
-        """Find Java executable in system PATH or JAVA_HOME"""
-        # Try java command directly
+        # Python < 3.11: hash the mapped pages directly
+        digest = hashlib.new(algorithm)
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                digest.update(mapped)
+        return digest.hexdigest()
+
+
+def _temp_root(aab_file):
+    """Prefer RAM-backed /dev/shm for throwaway files when it has room for them"""
+    shm = '/dev/shm'
+    if not (sys.platform.startswith('linux') and os.path.isdir(shm)):
+        return None
+    try:
+        if shutil.disk_usage(shm).free > 2 * os.path.getsize(aab_file):
+            return shm
+    except OSError:
+        pass
+    return None
+
+
+def _extract_universal_apk(apks_file, output_file):
+    """Stream universal.apk out of an APK set into output_file
+    
+    The .apks output is a plain ZIP archive, so this replaces a second
+    bundletool run with 'extract-apks'. Raises KeyError when the archive
+    has no universal.apk, before output_file is touched.
+    """
+    with zipfile.ZipFile(apks_file) as apks:
+        apks.getinfo('universal.apk')
+        with apks.open('universal.apk') as src, open(output_file, 'wb') as out:
+            shutil.copyfileobj(src, out, length=1024 * 1024)
+
+
+def _prune_apks_cache(keep):
+    """Delete least recently used APK sets until the cache fits APKS_CACHE_MAX_BYTES"""
+    entries = []
+    try:
+        for path in CACHE_DIR.glob('*.apks'):
+            stat = path.stat()
+            entries.append((stat.st_mtime, stat.st_size, path))
+    except OSError:
+        return
+    
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= APKS_CACHE_MAX_BYTES:
+            break
+        if path == keep:
+            continue
         try:
-            subprocess.run(['java', '-version'], 
-                         capture_output=True, check=True)
-            return 'java'
-        except (subprocess.CalledProcessError, FileNotFoundError):
+            path.unlink()
+            total -= size
+        except OSError:
             pass
-        
-        # Try JAVA_HOME environment variable
-        java_home = os.environ.get('JAVA_HOME')
-        if java_home:
-            java_exe = Path(java_home) / 'bin' / 'java'
-            if java_exe.exists():
-                return str(java_exe)
-        
-        raise RuntimeError("Java not found. Please install Java or set JAVA_HOME environment variable.")
+
+
+def _file_signature(path):
+    """Return a cheap 'mtime:size' change signature for a file"""
+    stat = os.stat(path)
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def _read_stamp(stamp_file):
+    """Return the contents of an output stamp file, or None if it cannot be read"""
+    try:
+        return Path(stamp_file).read_text(encoding='utf-8')
+    except OSError:
+        return None
+
+
+def _write_stamp(stamp_file, stamp_key):
+    """Atomically record the inputs an output was built from"""
+    stamp_file = Path(stamp_file)
+    fd, tmp_path = tempfile.mkstemp(dir=str(stamp_file.parent), suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(stamp_key)
+    os.replace(tmp_path, str(stamp_file))
+
+
+def _load_compiled_config(config_file):
+    """Load a config written by --compile-config
+    
+    Returns (config, fresh) where fresh is False when any recorded input
+    changed since compiling, or the Java executable is gone, in which case
+    the caller must fall back to the full parse and probe path.
+    """
+    try:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Compiled config not found: {config_file}")
+    except ValueError as e:
+        raise RuntimeError(f"Error reading compiled config: {e}")
+    
+    if not isinstance(config, dict) or config.get('version') != COMPILED_CONFIG_VERSION:
+        raise RuntimeError(f"Unsupported compiled config, re-run --compile-config: {config_file}")
+    
+    try:
+        for path, mtime in config['mtimes'].items():
+            if os.stat(path).st_mtime_ns != mtime:
+                return config, False
+    except OSError:
+        return config, False
+    
+    return config, shutil.which(config['java_cmd']) is not None
+
+
+# Only escapes that make sense in a path are decoded; any other \X (such as
+# the \U in an unescaped C:\Users\...) is kept verbatim
+_PROPERTY_ESCAPE_RE = re.compile(r'\\(u[0-9a-fA-F]{4}|[\\:= ])')
+
+
+def _unescape_property(value):
+    """Decode the \\\\, \\:, \\=, \\<space> and \\uXXXX properties escapes in a single pass"""
+    def replace(match):
+        escape = match.group(1)
+        if len(escape) == 5:
+            return chr(int(escape[1:], 16))
+        return escape
+    
+    return _PROPERTY_ESCAPE_RE.sub(replace, value)
+
+
+class BundletoolWrapper:
+    def __init__(self, bundletool_path, verbose=False, java_cmd=None):
+        self.bundletool_path = Path(bundletool_path)
+        self.verbose = verbose
+        self.java_cmd = java_cmd or _find_java()
+        self._bundletool_digest = None
     
     def _read_signing_properties(self, properties_file):
         """Read signing properties from file"""
         properties = {}
         try:
-            with open(properties_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#') and '=' in line:
-                        key, value = line.split('=', 1)
-                        key = key.strip()
-                        value = value.strip()
-                        
-                        # Handle escaped paths (especially for Windows paths)
-                        # Convert escaped backslashes to regular backslashes
-                        if key == 'release.keystore':
-                            # Unescape common escape sequences in file paths
-                            value = value.replace('\\\\', '\\')
-                            value = value.replace('\\:', ':')
-                            # Handle the specific case of C\:\\ -> C:\
-                            # value = value.replace('C\\:', 'C:')
-                            # More general approach: decode escape sequences
-                            try:
-                                # Try to decode as if it were a Python string literal
-                                value = value.encode().decode('unicode_escape')
-                            except (UnicodeDecodeError, UnicodeError):
-                                # If decoding fails, use the value as-is
-                                pass
-                        
-                        properties[key] = value
+            # Read the whole file at once rather than line by line
+            content = Path(properties_file).read_text(encoding='utf-8')
+            for line in content.split('\n'):
+                line = line.strip()
+                if line and not line.startswith('#') and '=' in line:
+                    key, value = line.split('=', 1)
+                    key = key.strip()
+                    value = value.strip()
+                    
+                    # Handle escaped paths (especially for Windows paths),
+                    # e.g. C\:\\keys\\release.jks -> C:\keys\release.jks
+                    if key == 'release.keystore' and '\\' in value:
+                        value = _unescape_property(value)
+                    
+                    properties[key] = value
         except FileNotFoundError:
             raise FileNotFoundError(f"Properties file not found: {properties_file}")
         except Exception as e:
@@ -104,102 +251,350 @@ class BundletoolWrapper:
     
     def _validate_inputs(self, aab_file, output_file, signing_properties):
         """Validate input files and parameters"""
-        # Check AAB file exists
-        if not Path(aab_file).exists():
-            raise FileNotFoundError(f"AAB file not found: {aab_file}")
+        # Check AAB, bundletool and keystore exist with one stat() each
+        required_files = [
+            (aab_file, 'AAB file'),
+            (self.bundletool_path, 'Bundletool JAR'),
+            (signing_properties['release.keystore'], 'Keystore file'),
+        ]
+        for path, description in required_files:
+            try:
+                os.stat(path)
+            except FileNotFoundError:
+                raise FileNotFoundError(f"{description} not found: {path}")
         
-        # Check bundletool exists
-        if not self.bundletool_path.exists():
-            raise FileNotFoundError(f"Bundletool JAR not found: {self.bundletool_path}")
+        # Create output directory if it doesn't exist
+        parent = Path(output_file).parent
+        if parent != Path('.') and not parent.is_dir():
+            parent.mkdir(parents=True, exist_ok=True)
+    
+    def _bundletool_sha256(self):
+        """Return the SHA-256 of the bundletool JAR, computed once per wrapper"""
+        if self._bundletool_digest is None:
+            self._bundletool_digest = _file_digest(self.bundletool_path, 'sha256')
+        return self._bundletool_digest
+    
+    def _apks_cache_key(self, aab_file, signing_props):
+        """Key a built APK set on everything that affects its content"""
+        # The file hashes are independent and hashlib releases the GIL while
+        # digesting, so overlap them instead of reading the files one by one
+        with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
+            aab_digest = executor.submit(_file_digest, aab_file, 'blake2b')
+            keystore_digest = executor.submit(_file_digest, signing_props['release.keystore'], 'blake2b')
+            bundletool_digest = executor.submit(self._bundletool_sha256)
+            parts = [
+                aab_digest.result(),
+                keystore_digest.result(),
+                signing_props['key.alias'],
+                bundletool_digest.result(),
+                # Wrong passwords must miss the cache so bundletool rejects them;
+                # only a digest of them ends up in the (hashed) key
+                hashlib.blake2b('\0'.join([signing_props['keystore.password'],
+                                            signing_props['key.password']]).encode('utf-8')).hexdigest(),
+            ]
+        return hashlib.blake2b('\0'.join(parts).encode('utf-8')).hexdigest()
+    
+    def _java_identity(self):
+        """Return 'resolved path:mtime' of the Java executable, or None if it cannot be found"""
+        java_path = shutil.which(self.java_cmd)
+        if java_path is None:
+            return None
+        java_path = os.path.realpath(java_path)
+        try:
+            return f"{java_path}:{os.stat(java_path).st_mtime_ns}"
+        except OSError:
+            return None
+    
+    def _ensure_cds_archive(self):
+        """Return JVM options for an AppCDS archive of bundletool, creating it on first use
         
-        # Check keystore exists
-        keystore_path = signing_properties['release.keystore']
-        if not Path(keystore_path).exists():
-            raise FileNotFoundError(f"Keystore file not found: {keystore_path}")
+        The archive is keyed on the SHA-256 of the bundletool JAR and on the
+        Java executable, so upgrading bundletool or switching JDKs invalidates
+        it. JVMs without dynamic archiving (JDK < 13) fail to create it; that
+        is recorded in an .unsupported marker so the dump is not retried, and
+        no extra options are returned.
+        """
+        java_identity = self._java_identity()
+        if java_identity is None:
+            return []
         
-        # Create output directory if it doesn't exist
-        output_path = Path(output_file)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        archive_key = hashlib.blake2b(
+            f"{self._bundletool_sha256()}|{java_identity}".encode('utf-8'), digest_size=16).hexdigest()
+        jsa_path = CACHE_DIR / f"bundletool-{archive_key}.jsa"
+        unsupported_marker = CACHE_DIR / f"bundletool-{archive_key}.unsupported"
+        
+        if unsupported_marker.exists():
+            return []
+        
+        if not jsa_path.exists():
+            try:
+                CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                # Dump to a private name first so concurrent runs never map a partial archive
+                tmp_path = CACHE_DIR / f"{jsa_path.name}.{os.getpid()}.tmp"
+                dump_cmd = [
+                    self.java_cmd, *JVM_SHORTLIVED_FLAGS,
+                    f"-XX:ArchiveClassesAtExit={tmp_path}",
+                    '-jar', str(self.bundletool_path),
+                    'help', 'build-apks'
+                ]
+                result = subprocess.run(dump_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                if result.returncode != 0 or not tmp_path.exists():
+                    if tmp_path.exists():
+                        tmp_path.unlink()
+                    unsupported_marker.touch()
+                    return []
+                os.replace(str(tmp_path), str(jsa_path))
+            except OSError:
+                return []
+        
+        return [f"-XX:SharedArchiveFile={jsa_path}", '-Xshare:auto']
+    
+    def compile_config(self, signing_properties_file, config_file):
+        """Pre-parse and validate the signing setup into a config file for --config
+        
+        The file records the parsed signing properties, the Java executable and
+        the mtimes of every input, so loading it can skip parsing and probing
+        until one of them changes. It holds the passwords in plain text, just
+        like the properties file it was compiled from.
+        """
+        signing_props = dict(self._read_signing_properties(signing_properties_file))
+        
+        # Store absolute paths so the config works from any directory
+        try:
+            properties_path = str(Path(signing_properties_file).resolve())
+            bundletool_path = str(self.bundletool_path.resolve())
+            signing_props['release.keystore'] = str(Path(signing_props['release.keystore']).resolve())
+            watched_files = [properties_path, bundletool_path, signing_props['release.keystore']]
+            mtimes = {path: os.stat(path).st_mtime_ns for path in watched_files}
+        except FileNotFoundError as e:
+            raise FileNotFoundError(f"File not found: {e.filename}")
+        
+        config = {
+            'version': COMPILED_CONFIG_VERSION,
+            'signing_properties': properties_path,
+            'bundletool': bundletool_path,
+            'java_cmd': self.java_cmd,
+            'signing_props': signing_props,
+            'mtimes': mtimes,
+        }
+        
+        config_file = Path(config_file)
+        fd, tmp_path = tempfile.mkstemp(dir=str(config_file.parent), suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(config, f)
+        os.replace(tmp_path, str(config_file))
     
-    def convert_aab_to_apk(self, aab_file, output_file, signing_properties_file):
-        """Convert AAB to APK with signing"""
-        print(f"Converting {aab_file} to {output_file}...")
+    def convert_aab_to_apk(self, aab_file, output_file, signing_properties_file, signing_props=None):
+        """Convert AAB to APK with signing
         
+        signing_props may carry already-parsed properties (e.g. from a compiled
+        config), in which case signing_properties_file is not read again; it
+        is then only used for the up-to-date check and may be None.
+        """
         # Read signing properties
-        signing_props = self._read_signing_properties(signing_properties_file)
+        if signing_props is None:
+            signing_props = self._read_signing_properties(signing_properties_file)
+        
+        self._convert(aab_file, output_file, signing_props, signing_properties_file)
+    
+    def convert_many(self, jobs, signing_properties_file, max_workers=1, signing_props=None):
+        """Convert several (aab_file, output_file) pairs signed with the same config
+        
+        The signing properties are read and the bundletool JAR is hashed once
+        for the whole batch, including when the work is spread over a pool. bundletool has no batch mode, so every AAB that
+        misses the APK set cache still costs one JVM start; the AppCDS archive
+        keeps those starts cheap. With max_workers > 1 the conversions run in
+        a process pool, each worker with its own wrapper. signing_props and a
+        None signing_properties_file work as in convert_aab_to_apk.
+        """
+        if signing_props is None:
+            signing_props = self._read_signing_properties(signing_properties_file)
+        
+        if max_workers <= 1 or len(jobs) <= 1:
+            for aab_file, output_file in jobs:
+                self._convert(aab_file, output_file, signing_props, signing_properties_file)
+            return
+        
+        # Hash the JAR here so workers don't each hash it again; a missing
+        # JAR is left for the workers' input validation to report
+        try:
+            bundletool_digest = self._bundletool_sha256()
+        except OSError:
+            bundletool_digest = None
+        
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                (aab_file, executor.submit(_convert_job, str(self.bundletool_path), bundletool_digest,
+                                           self.java_cmd, self.verbose, logging.getLogger().getEffectiveLevel(),
+                                           aab_file, output_file, signing_props, signing_properties_file))
+                for aab_file, output_file in jobs
+            ]
+            # Report every failed job, then surface the first failure
+            first_error = None
+            for aab_file, future in futures:
+                error = future.exception()
+                if error is not None:
+                    logger.error("Failed to convert %s: %s", aab_file, error)
+                    first_error = first_error or error
+            if first_error is not None:
+                raise first_error
+    
+    def _convert(self, aab_file, output_file, signing_props, signing_properties_file):
+        """Convert one AAB to APK using already-parsed signing properties"""
+        logger.info("Converting %s to %s...", aab_file, output_file)
         
         # Validate inputs
         self._validate_inputs(aab_file, output_file, signing_props)
         
-        # Create temporary directory for intermediate files
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_apks = Path(temp_dir) / "temp.apks"
-            
-            # Step 1: Generate universal APK set
-            print("Step 1: Generating universal APK set...")
-            build_cmd = [
-                self.java_cmd, '-jar', str(self.bundletool_path),
-                'build-apks',
-                '--bundle', str(aab_file),
-                '--output', str(temp_apks),
-                '--mode', 'universal',
-                '--ks', signing_props['release.keystore'],
-                '--ks-pass', f"pass:{signing_props['keystore.password']}",
-                '--ks-key-alias', signing_props['key.alias'],
-                '--key-pass', f"pass:{signing_props['key.password']}"
-            ]
-            
+        # Skip the conversion when nothing changed since the last successful run
+        stamp_file = Path(f"{output_file}.stamp")
+        keystore_file = signing_props['release.keystore']
+        # signing_properties_file may be None when signing_props were passed in
+        stamp_inputs = [aab_file, keystore_file, signing_properties_file, self.bundletool_path]
+        stamp_key = ":".join(_file_signature(path) for path in stamp_inputs if path is not None)
+        if (Path(output_file).exists() and
+                _read_stamp(stamp_file) == f"{stamp_key}\n{_file_signature(output_file)}"):
+            logger.info("✓ %s is up-to-date", output_file)
+            return
+        # Drop a stale stamp so a failed run can never look up-to-date later
+        if stamp_file.exists():
+            stamp_file.unlink()
+        
+        # APK sets are cached per AAB, signing credentials and bundletool version
+        cached_apks = CACHE_DIR / f"{self._apks_cache_key(aab_file, signing_props)}.apks"
+        logger.debug("APK set cache entry: %s", cached_apks)
+        
+        # Build inside the cache directory so a new APK set is renamed into
+        # the cache rather than copied; fall back to RAM when there is no cache
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            use_cache = True
+            temp_root = str(CACHE_DIR)
+        except OSError:
+            use_cache = False
+            temp_root = _temp_root(aab_file)
+        
+        # Step 1: Reuse the cached universal APK set when it is intact
+        reused = False
+        if cached_apks.exists():
+            logger.info("Step 1: Reusing cached universal APK set...")
+            # Bump the mtime so pruning treats the entry as recently used
             try:
-                result = subprocess.run(build_cmd, capture_output=True, text=True, check=True)
-                print("✓ Universal APK set generated successfully")
-            except subprocess.CalledProcessError as e:
-                print(f"Error generating APK set: {e}")
-                print(f"Command output: {e.stdout}")
-                print(f"Command error: {e.stderr}")
-                raise
-            
-            # Step 2: Extract universal APK
-            print("Step 2: Extracting universal APK...")
-            extract_cmd = [
-                self.java_cmd, '-jar', str(self.bundletool_path),
-                'extract-apks',
-                '--apks', str(temp_apks),
-                '--output-dir', temp_dir,
-                '--device-spec', self._create_device_spec(temp_dir)
-            ]
+                os.utime(str(cached_apks))
+            except OSError:
+                pass
             
+            logger.info("Step 2: Extracting universal APK...")
             try:
-                result = subprocess.run(extract_cmd, capture_output=True, text=True, check=True)
-                print("✓ Universal APK extracted successfully")
-            except subprocess.CalledProcessError as e:
-                print(f"Error extracting APK: {e}")
-                print(f"Command output: {e.stdout}")
-                print(f"Command error: {e.stderr}")
-                raise
-            
-            # Step 3: Copy the universal APK to output location
-            universal_apk = Path(temp_dir) / "universal.apk"
-            if universal_apk.exists():
-                import shutil
-                shutil.copy2(universal_apk, output_file)
-                print(f"✓ APK saved to: {output_file}")
-            else:
-                raise RuntimeError("Universal APK not found after extraction")
-    
-    def _create_device_spec(self, temp_dir):
-        """Create a device specification file for universal APK extraction"""
-        device_spec_path = Path(temp_dir) / "device_spec.json"
-        device_spec_content = """{
-  "supportedAbis": ["arm64-v8a"],
-  "supportedLocales": ["en"],
-  "screenDensity": 480,
-  "sdkVersion": 34
-}"""
+                _extract_universal_apk(cached_apks, output_file)
+                reused = True
+            except (zipfile.BadZipFile, KeyError):
+                # A corrupt entry would otherwise block this AAB for good
+                logger.warning("Cached APK set %s is corrupt, rebuilding", cached_apks)
+                cached_apks.unlink()
+            except OSError as e:
+                raise RuntimeError(f"Error extracting APK: {e}")
+        
+        if not reused:
+            # Create temporary directory for intermediate files
+            with tempfile.TemporaryDirectory(prefix='build-', dir=temp_root) as temp_dir:
+                temp_apks = Path(temp_dir) / "temp.apks"
+                
+                logger.info("Step 1: Generating universal APK set...")
+                # Reuse (or create) a class-data archive to cut JVM startup time
+                cds_options = self._ensure_cds_archive()
+                build_cmd = [
+                    self.java_cmd, *JVM_SHORTLIVED_FLAGS, *cds_options, '-jar', str(self.bundletool_path),
+                    'build-apks',
+                    '--bundle', str(aab_file),
+                    '--output', str(temp_apks),
+                    '--mode', 'universal',
+                    '--ks', signing_props['release.keystore'],
+                    '--ks-pass', f"pass:{signing_props['keystore.password']}",
+                    '--ks-key-alias', signing_props['key.alias'],
+                    '--key-pass', f"pass:{signing_props['key.password']}"
+                ]
+                
+                try:
+                    # bundletool's log goes straight to the terminal in verbose
+                    # mode; only stderr is kept for error reporting
+                    result = subprocess.run(build_cmd, check=True,
+                                            stdout=None if self.verbose else subprocess.DEVNULL,
+                                            stderr=subprocess.PIPE)
+                    logger.info("✓ Universal APK set generated successfully")
+                except FileNotFoundError:
+                    raise RuntimeError(f"Java not found ({self.java_cmd}). "
+                                       "Please install Java or set JAVA_HOME environment variable.")
+                except subprocess.CalledProcessError as e:
+                    # stderr stays raw bytes; only the tail is decoded, on failure
+                    stderr_tail = (e.stderr or b'')[-STDERR_TAIL_BYTES:].decode('utf-8', errors='replace')
+                    logger.error("Error generating APK set: %s", e)
+                    logger.error("Command error: %s", stderr_tail)
+                    raise
+                
+                if use_cache:
+                    os.replace(str(temp_apks), str(cached_apks))
+                    apks_file = cached_apks
+                else:
+                    apks_file = temp_apks
+                
+                # Step 2: Extract universal APK
+                logger.info("Step 2: Extracting universal APK...")
+                try:
+                    _extract_universal_apk(apks_file, output_file)
+                except KeyError:
+                    raise RuntimeError("Universal APK not found after extraction")
+                except (zipfile.BadZipFile, OSError) as e:
+                    raise RuntimeError(f"Error extracting APK: {e}")
+        
+        logger.info("✓ APK saved to: %s", output_file)
         
-        with open(device_spec_path, 'w', encoding='utf-8') as f:
-            f.write(device_spec_content)
+        if use_cache:
+            _prune_apks_cache(keep=cached_apks)
         
-        return str(device_spec_path)
+        # Record the output as written so a replaced or corrupted APK is rebuilt
+        _write_stamp(stamp_file, f"{stamp_key}\n{_file_signature(output_file)}")
+
+
+def _convert_job(bundletool_path, bundletool_digest, java_cmd, verbose, log_level,
+                 aab_file, output_file, signing_props, signing_properties_file):
+    """Process pool entry point: convert one AAB with a worker-local wrapper"""
+    # No-op in forked workers, which inherit the parent's logging setup
+    logging.basicConfig(level=log_level, stream=sys.stderr, format='%(message)s')
+    wrapper = BundletoolWrapper(bundletool_path, verbose=verbose, java_cmd=java_cmd)
+    # Seed the digest the parent already computed
+    wrapper._bundletool_digest = bundletool_digest
+    wrapper._convert(aab_file, output_file, signing_props, signing_properties_file)
+
+
+def _available_memory():
+    """Return the memory available to new processes in bytes, or None if unknown"""
+    # On Linux, MemAvailable counts reclaimable page cache; sysconf's
+    # SC_AVPHYS_PAGES is only MemFree and badly undercounts on build machines
+    try:
+        with open('/proc/meminfo', 'r', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    
+    # Elsewhere only free physical pages are exposed, and only on POSIX systems
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def _default_workers(job_count):
+    """Size the process pool for bundletool runs (~1-2 cores and ~1.5 GB RAM each)"""
+    workers = min(job_count, (os.cpu_count() or 1) // 2)
+    
+    available = _available_memory()
+    if available is not None:
+        workers = min(workers, available // BUNDLETOOL_MEMORY_PER_WORKER)
+    
+    return max(1, workers)
 
 
 def main():
@@ -209,30 +604,81 @@ def main():
         epilog=__doc__
     )
     
-    parser.add_argument('--aab', default=DEFAULT_CONFIG['aab_file'],
-                       help=f'Path to input AAB file (default: {DEFAULT_CONFIG["aab_file"]})')
-    parser.add_argument('--output', default=DEFAULT_CONFIG['output_file'],
-                       help=f'Path to output APK file (default: {DEFAULT_CONFIG["output_file"]})')
+    parser.add_argument('--aab', nargs='+', default=[DEFAULT_CONFIG['aab_file']],
+                       help=f'Path to input AAB file(s) (default: {DEFAULT_CONFIG["aab_file"]})')
+    parser.add_argument('--output', nargs='+',
+                       help=f'Path to output APK file(s), one per AAB (default: {DEFAULT_CONFIG["output_file"]}, '
+                            'or <aab name>-universal.apk next to each AAB when converting several)')
     parser.add_argument('--bundletool', default=DEFAULT_CONFIG['bundletool_jar'],
                        help=f'Path to bundletool JAR file (default: {DEFAULT_CONFIG["bundletool_jar"]})')
     parser.add_argument('--signing', default=DEFAULT_CONFIG['signing_properties'],
                        help=f'Path to signing properties file (default: {DEFAULT_CONFIG["signing_properties"]})')
+    parser.add_argument('--compile-config', metavar='PROPERTIES',
+                       help='Pre-parse and validate a signing properties file (with --bundletool) '
+                            'into a compiled config, then exit')
+    parser.add_argument('--compiled-output', default='signing.compiled.json',
+                       help='Where --compile-config writes the compiled config (default: signing.compiled.json)')
+    parser.add_argument('--config',
+                       help='Use a compiled config instead of --signing/--bundletool')
     parser.add_argument('--verbose', '-v', action='store_true',
                        help='Enable verbose output')
+    parser.add_argument('--quiet', '-q', action='store_true',
+                       help='Only report errors')
     
     args = parser.parse_args()
     
+    if args.verbose:
+        log_level = logging.DEBUG
+    elif args.quiet:
+        log_level = logging.WARNING
+    else:
+        log_level = logging.INFO
+    logging.basicConfig(level=log_level, stream=sys.stderr, format='%(message)s')
+    
+    if args.output is None:
+        if len(args.aab) == 1:
+            args.output = [DEFAULT_CONFIG['output_file']]
+        else:
+            args.output = [str(Path(aab).with_name(f"{Path(aab).stem}-universal.apk")) for aab in args.aab]
+    elif len(args.output) != len(args.aab):
+        parser.error('--output must list one APK path per --aab file')
+    
     try:
+        if args.compile_config:
+            wrapper = BundletoolWrapper(args.bundletool, verbose=args.verbose)
+            wrapper.compile_config(args.compile_config, args.compiled_output)
+            logger.info("✓ Compiled %s to %s", args.compile_config, args.compiled_output)
+            return
+        
+        # A fresh compiled config skips parsing the properties and probing Java
+        java_cmd = None
+        signing_props = None
+        if args.config:
+            config, fresh = _load_compiled_config(args.config)
+            args.signing = config['signing_properties']
+            args.bundletool = config['bundletool']
+            if fresh:
+                java_cmd = config['java_cmd']
+                signing_props = config['signing_props']
+            else:
+                logger.info("Compiled config %s is out of date, reading %s", args.config, args.signing)
+        
         # Create bundletool wrapper
-        wrapper = BundletoolWrapper(args.bundletool)
+        wrapper = BundletoolWrapper(args.bundletool, verbose=args.verbose, java_cmd=java_cmd)
         
         # Convert AAB to APK
-        wrapper.convert_aab_to_apk(args.aab, args.output, args.signing)
+        if len(args.aab) == 1:
+            wrapper.convert_aab_to_apk(args.aab[0], args.output[0], args.signing, signing_props=signing_props)
+        else:
+            jobs = list(zip(args.aab, args.output))
+            wrapper.convert_many(jobs, args.signing, max_workers=_default_workers(len(jobs)),
+                                 signing_props=signing_props)
         
-        print(f"\n🎉 Successfully converted {args.aab} to {args.output}")
+        for aab_file, output_file in zip(args.aab, args.output):
+            logger.info("🎉 Successfully converted %s to %s", aab_file, output_file)
         
     except Exception as e:
-        print(f"❌ Error: {e}", file=sys.stderr)
+        logger.error("❌ Error: %s", e)
         sys.exit(1)
 
 